@@ -31,28 +31,14 @@ _modules = {
 
 
 # Handle reload on script re-execution
+# widgets is reloaded first since car_rig binds it at import time
 if "bpy" in locals():
+    importlib.reload(widgets)
     importlib.reload(bake_operators)
     importlib.reload(car_rig)
-    importlib.reload(widgets)
     importlib.reload(mesh_grouper)
 
 
-def enumerate_ground_sensors(bones):
-    bone = bones.get('GroundSensor_Axle_F')
-    if bone is not None:
-        yield bone
-        for bone in bones:
-            if bone.name.startswith('GroundSensor_F'):
-                yield bone
-    bone = bones.get('GroundSensor_Axle_B')
-    if bone is not None:
-        yield bone
-        for bone in bones:
-            if bone.name.startswith('GroundSensor_B'):
-                yield bone
-
-
 class RIGACAR_PT_mixin:
 
     def __init__(self):
@@ -96,7 +82,7 @@ class RIGACAR_PT_mixin:
             layout.operator(car_rig.POSE_OT_carFollowPath.bl_idname, text="Follow Path Settings")
 
     def display_ground_sensors_section(self, context):
-        for ground_sensor in enumerate_ground_sensors(context.object.pose.bones):
+        for ground_sensor in car_rig.iter_ground_sensors(context.object):
             ground_projection_constraint = ground_sensor.constraints.get('Ground projection')
             self.layout.label(text=ground_sensor.name, icon='BONE_DATA')
             if ground_projection_constraint is not None:
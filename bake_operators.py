@@ -794,19 +794,15 @@ class ANIM_OT_carClearSteeringWheelsRotation(bpy.types.Operator):
         return {'FINISHED'}
 
 
-def register():
-    bpy.utils.register_class(ANIM_OT_carWheelsRotationBake)
-    bpy.utils.register_class(ANIM_OT_carSteeringBake)
-    bpy.utils.register_class(ANIM_OT_carDriftBake)
-    bpy.utils.register_class(ANIM_OT_carClearSteeringWheelsRotation)
+classes = (
+    ANIM_OT_carWheelsRotationBake,
+    ANIM_OT_carSteeringBake,
+    ANIM_OT_carDriftBake,
+    ANIM_OT_carClearSteeringWheelsRotation,
+)
 
 
-def unregister():
-    bpy.utils.unregister_class(ANIM_OT_carClearSteeringWheelsRotation)
-    bpy.utils.unregister_class(ANIM_OT_carDriftBake)
-    bpy.utils.unregister_class(ANIM_OT_carSteeringBake)
-    bpy.utils.unregister_class(ANIM_OT_carWheelsRotationBake)
-
+register, unregister = bpy.utils.register_classes_factory(classes)
 
 if __name__ == "__main__":
     register()
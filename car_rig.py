@@ -22,9 +22,13 @@ import bpy
 import math
 import bpy_extras
 import mathutils
+import numpy as np
 import re
+import time
 from math import inf
 from rna_prop_ui import rna_idprop_ui_create
+from . import bake_operators
+from . import widgets
 
 # Bone Collection Layers - Visible Layers
 LAYER_1 = 'Layer 1'  # Main control bones (visible)
@@ -62,6 +66,20 @@ def enumerate_ground_sensors(bones):
                 yield bone
 
 
+def iter_ground_sensors(ob):
+    '''Yields ground sensor pose bones using the names recorded at rig generation.
+    Falls back to enumerate_ground_sensors for rigs generated before the names were stored.'''
+    names = ob.data.get('tq_ground_sensor_bones')
+    if names is None:
+        yield from enumerate_ground_sensors(ob.pose.bones)
+        return
+    bones = ob.pose.bones
+    for name in names:
+        bone = bones.get(name)
+        if bone is not None:
+            yield bone
+
+
 def deselect_edit_bones(ob):
     for b in ob.data.edit_bones:
         b.select = False
@@ -178,7 +196,6 @@ def name_range(prefix, nb=1000):
 def get_widget(name):
     widget = bpy.data.objects.get(name)
     if widget is None:
-        from . import widgets
         widgets.create()
         widget = bpy.data.objects.get(name)
     return widget
@@ -753,6 +770,7 @@ class ArmatureGenerator(object):
 
             bpy.ops.object.mode_set(mode='POSE')
             self.generate_constraints_on_rig()
+            self.ob.data['tq_ground_sensor_bones'] = [b.name for b in enumerate_ground_sensors(self.ob.pose.bones)]
             self.ob.display_type = 'WIRE'
 
             self.generate_bone_groups()
@@ -2079,7 +2097,7 @@ class POSE_OT_carSetGround(bpy.types.Operator):
         if ground is None:
             self.report({'WARNING'}, "No ground object set")
             return {"CANCELLED"}
-        for bone in enumerate_ground_sensors(context.object.pose.bones):
+        for bone in iter_ground_sensors(context.object):
             cns = bone.constraints.get('Ground projection')
             if cns:
                 cns.target = ground
@@ -2093,6 +2111,7 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     CONSTRAINT_NAME = "tq_follow_path"
+    CURVE_LENGTH_REFRESH_DELAY = .1
 
     animation_mode: bpy.props.EnumProperty(
         name="Animation Mode",
@@ -2157,7 +2176,7 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
                 context.object.data.get('Car Rig'))
 
     def invoke(self, context, event):
-        return context.window_manager.invoke_props_dialog(self)
+        return context.window_manager.invoke_props_dialog(self, width=400)
 
     def draw(self, context):
         layout = self.layout
@@ -2180,7 +2199,7 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
             # Show calculated end frame
             curve = context.scene.tq_target_path_object
             if curve and curve.type == 'CURVE':
-                curve_length = self.get_curve_length(curve)
+                curve_length = self._get_cached_curve_length(curve)
                 fps = context.scene.render.fps
                 calculated_end = self.calculate_end_frame_from_speed(
                     self.frame_start, curve_length, self.speed_kmh, fps
@@ -2260,10 +2279,8 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
 
         # Ensure the scene playback range includes the requested frames
         scene = context.scene
-        if self.frame_start < scene.frame_start:
-            scene.frame_start = self.frame_start
-        if self.frame_end > scene.frame_end:
-            scene.frame_end = self.frame_end
+        scene.frame_start = min(scene.frame_start, self.frame_start)
+        scene.frame_end = max(scene.frame_end, self.frame_end)
 
         # Drive the follow-path factor from 1 -> 0 across the chosen frame range
         follow_path_constraint.offset_factor = 1.0
@@ -2277,7 +2294,7 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
 
         # Setup ground sensors
         if ground_object is not None:
-            for bone in enumerate_ground_sensors(active_object.pose.bones):
+            for bone in iter_ground_sensors(active_object):
                 cns = bone.constraints.get('Ground projection')
                 if cns:
                     cns.target = ground_object
@@ -2285,7 +2302,6 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
         # Clear any previously generated steering/wheel animations if requested
         if self.clear_bake:
             try:
-                from . import bake_operators
                 clearer = bake_operators.ANIM_OT_carClearSteeringWheelsRotation()
                 clearer.clear_steering = True
                 clearer.clear_drift = True
@@ -2315,45 +2331,9 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
         bpy.ops.object.mode_set(mode='OBJECT')
         self.report({'INFO'}, f"Follow path animation created for {active_object.name}")
         return {'FINISHED'}
-        return {'FINISHED'}
-
-    def _bake_follow_path_constraint_to_keyframes(self, context, armature, root_bone, frame_start, frame_end):
-        """Extract the follow path constraint's evaluated location into explicit keyframes.
-        
-        The follow path constraint drives both location and rotation naturally.
-        We need explicit location keyframes in the action so the wheel baking algorithm
-        can read the actual motion (ignoring rotation).
-        """
-        # Get the action
-        if not armature.animation_data or not armature.animation_data.action:
-            return
-        
-        action = armature.animation_data.action
-        
-        # Ensure we're in POSE mode for keyframing
-        if context.object.mode != 'POSE':
-            bpy.ops.object.mode_set(mode='POSE')
-        
-        # For each frame, read the constraint-evaluated position and store it
-        for frame in range(frame_start, frame_end + 1):
-            context.scene.frame_set(frame)
-            
-            # Get the Root bone's actual world location (driven by follow path constraint)
-            world_location = root_bone.matrix.translation.copy()
-            
-            # Convert to armature-local space
-            armature_location = armature.matrix_world.inverted() @ world_location
-            
-            # Set the location to what the constraint calculated
-            root_bone.location = armature_location
-            
-            # Insert location keyframe (this overwrites any previous ones)
-            root_bone.keyframe_insert('location', frame=frame)
 
     def _bake_wheels_rotation_direct(self, context, frame_start, frame_end):
         """Bake wheel rotation without opening operator dialogs"""
-        from . import bake_operators
-        
         baker = bake_operators.ANIM_OT_carWheelsRotationBake()
         baker.frame_start = frame_start
         baker.frame_end = frame_end
@@ -2363,8 +2343,6 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
 
     def _bake_steering_rotation_direct(self, context, frame_start, frame_end):
         """Bake steering rotation without opening operator dialogs"""
-        from . import bake_operators
-        
         steering_baker = bake_operators.ANIM_OT_carSteeringBake()
         steering_baker.frame_start = frame_start
         steering_baker.frame_end = frame_end
@@ -2381,6 +2359,25 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
             bone_offset = abs(steering.head_local.y - mch_steering_rotation.head_local.y)
             steering_baker._bake_steering_rotation(context, bone_offset, mch_steering_rotation)
 
+    def _get_cached_curve_length(self, curve_object):
+        """Return the curve length, recomputed when the target curve object or data changes.
+
+        The dialog redraws on every property change (e.g. while dragging the speed
+        slider), so the length is not measured again on each redraw. Changes to
+        the same curve (points or transform) are picked up at most every
+        CURVE_LENGTH_REFRESH_DELAY seconds.
+        """
+        # The length depends on both the curve data and the object's matrix_world,
+        # and curve data can be shared between objects
+        curve_key = (curve_object.as_pointer(), curve_object.data.as_pointer())
+        now = time.monotonic()
+        if (getattr(self, '_cached_curve_key', None) != curve_key or
+                now - getattr(self, '_last_compute_time', 0.0) > self.CURVE_LENGTH_REFRESH_DELAY):
+            self._cached_curve_len = self.get_curve_length(curve_object)
+            self._cached_curve_key = curve_key
+            self._last_compute_time = now
+        return self._cached_curve_len
+
     @staticmethod
     def get_offset_data_path(root_bone_name, fp_constraint_name):
         return f'pose.bones["{root_bone_name}"].constraints["{fp_constraint_name}"].offset_factor'
@@ -2391,45 +2388,38 @@ class POSE_OT_carFollowPath(bpy.types.Operator):
         if curve_object.type != 'CURVE':
             return 0.0
         
+        # Chords are measured on world space points so that non-uniform scale,
+        # rotation and shear are accounted for (translation does not affect lengths)
+        world_matrix = np.array(curve_object.matrix_world, dtype=np.float32)[:3, :3]
+
         total_length = 0.0
         for spline in curve_object.data.splines:
             # Calculate length by sampling points along the spline
             if spline.type == 'BEZIER':
                 # For Bezier curves, approximate by summing bezier point distances
                 # This is a simple approximation - for more accuracy, we'd need to sample the curve
-                points = [bp.co for bp in spline.bezier_points]
-                for i in range(len(points) - 1):
-                    total_length += (points[i+1] - points[i]).length
-                
-                # Add closing segment if cyclic
-                if spline.use_cyclic_u and len(points) > 1:
-                    total_length += (points[0] - points[-1]).length
-                    
-            elif spline.type == 'NURBS':
-                # For NURBS curves, use point distances
-                points = [p.co.xyz for p in spline.points]
-                for i in range(len(points) - 1):
-                    total_length += (points[i+1] - points[i]).length
-                
-                # Add closing segment if cyclic
-                if spline.use_cyclic_u and len(points) > 1:
-                    total_length += (points[0] - points[-1]).length
-                    
-            elif spline.type == 'POLY':
-                # For poly curves, use point distances
-                points = [p.co.xyz for p in spline.points]
-                for i in range(len(points) - 1):
-                    total_length += (points[i+1] - points[i]).length
-                
-                # Add closing segment if cyclic
-                if spline.use_cyclic_u and len(points) > 1:
-                    total_length += (points[0] - points[-1]).length
-        
-        # Apply object scale
-        scale = curve_object.matrix_world.to_scale()
-        avg_scale = (scale.x + scale.y + scale.z) / 3.0
-        
-        return total_length * avg_scale
+                nb_points = len(spline.bezier_points)
+                co = np.empty(3 * nb_points, dtype=np.float32)
+                spline.bezier_points.foreach_get('co', co)
+                points = co.reshape(nb_points, 3)
+            elif spline.type in ('NURBS', 'POLY'):
+                # For NURBS and poly curves, use point distances (co is xyzw)
+                nb_points = len(spline.points)
+                co = np.empty(4 * nb_points, dtype=np.float32)
+                spline.points.foreach_get('co', co)
+                points = co.reshape(nb_points, 4)[:, :3]
+            else:
+                continue
+
+            if nb_points < 2:
+                continue
+            # Add closing segment if cyclic
+            if spline.use_cyclic_u:
+                points = np.vstack((points, points[:1]))
+            points = points @ world_matrix.T
+            total_length += float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+        return total_length
     
     @staticmethod
     def calculate_end_frame_from_speed(start_frame, curve_length_m, speed_kmh, fps):
@@ -2522,7 +2512,7 @@ class POSE_OT_carClearFollowPathAnimation(bpy.types.Operator):
                 context.object.data.get('Car Rig'))
 
     def invoke(self, context, event):
-        return context.window_manager.invoke_props_dialog(self)
+        return context.window_manager.invoke_props_dialog(self, width=400)
 
     def draw(self, context):
         layout = self.layout
@@ -2557,12 +2547,7 @@ class POSE_OT_carClearFollowPathAnimation(bpy.types.Operator):
                     offset_factor_data_path = f'pose.bones["Root"].constraints["tq_follow_path"].offset_factor'
                     
                     # Find and remove the fcurve for follow path offset_factor
-                    fcurve_to_remove = None
-                    for fcurve in action.fcurves:
-                        if fcurve.data_path == offset_factor_data_path:
-                            fcurve_to_remove = fcurve
-                            break
-                    
+                    fcurve_to_remove = action.fcurves.find(offset_factor_data_path)
                     if fcurve_to_remove:
                         action.fcurves.remove(fcurve_to_remove)
                         self.report({'INFO'}, "Removed follow path keyframes")
@@ -2570,7 +2555,6 @@ class POSE_OT_carClearFollowPathAnimation(bpy.types.Operator):
         # Clear steering animation
         if self.clear_steering:
             try:
-                from . import bake_operators
                 clearer = bake_operators.ANIM_OT_carClearSteeringWheelsRotation()
                 clearer.clear_steering = True
                 clearer.clear_drift = False
@@ -2583,7 +2567,6 @@ class POSE_OT_carClearFollowPathAnimation(bpy.types.Operator):
         # Clear drift animation
         if self.clear_drift:
             try:
-                from . import bake_operators
                 clearer = bake_operators.ANIM_OT_carClearSteeringWheelsRotation()
                 clearer.clear_steering = False
                 clearer.clear_drift = True
@@ -2596,7 +2579,6 @@ class POSE_OT_carClearFollowPathAnimation(bpy.types.Operator):
         # Clear wheel rotation animation
         if self.clear_wheels:
             try:
-                from . import bake_operators
                 clearer = bake_operators.ANIM_OT_carClearSteeringWheelsRotation()
                 clearer.clear_steering = False
                 clearer.clear_drift = False
@@ -2611,68 +2593,68 @@ class POSE_OT_carClearFollowPathAnimation(bpy.types.Operator):
         return {'FINISHED'}
 
 
-def register():
-    bpy.utils.register_class(POSE_OT_carAnimationRigGenerate)
-    bpy.utils.register_class(OBJECT_OT_armatureCarDeformationRig)
-    bpy.utils.register_class(POSE_OT_carAnimationAddBrakeWheelBones)
-    bpy.utils.register_class(POSE_OT_carSetGround)
-    bpy.utils.register_class(POSE_OT_carFollowPath)
-    bpy.utils.register_class(POSE_OT_carClearFollowPathAnimation)
-    
-    bpy.types.Scene.tq_target_path_object = bpy.props.PointerProperty(
+SCENE_PROPERTIES = (
+    ('tq_target_path_object', lambda: bpy.props.PointerProperty(
         name="Follow Path Target",
         description="Path which rigged car should follow",
         poll=lambda self, obj: obj.type == 'CURVE',
         type=bpy.types.Object,
-    )
-    bpy.types.Scene.tq_ground_object = bpy.props.PointerProperty(
+    )),
+    ('tq_ground_object', lambda: bpy.props.PointerProperty(
         name="Ground Object",
         description="Object representing the ground to be used in animation of rigged car",
         type=bpy.types.Object,
-    )
-    bpy.types.Scene.tq_adjust_origin = bpy.props.BoolProperty(
+    )),
+    ('tq_adjust_origin', lambda: bpy.props.BoolProperty(
         name="Move Origin",
         description="Set origin of the armature at the same location as the SHP_Root bone",
         default=True
-    )
-    bpy.types.Scene.tq_follow_path_bake_wheels = bpy.props.BoolProperty(
+    )),
+    ('tq_follow_path_bake_wheels', lambda: bpy.props.BoolProperty(
         name="Follow Path Bake Wheels",
         description="Internal flag: whether to chain to wheel rotation baking after steering bake",
         default=False
-    )
-    bpy.types.Scene.tq_follow_path_frame_start = bpy.props.IntProperty(
+    )),
+    ('tq_follow_path_frame_start', lambda: bpy.props.IntProperty(
         name="Follow Path Frame Start",
         description="Internal: Start frame for follow path animation from follow path operator",
         default=1
-    )
-    bpy.types.Scene.tq_follow_path_frame_end = bpy.props.IntProperty(
+    )),
+    ('tq_follow_path_frame_end', lambda: bpy.props.IntProperty(
         name="Follow Path Frame End",
         description="Internal: End frame for follow path animation from follow path operator",
         default=240
-    )
+    )),
+)
+
+
+classes = (
+    POSE_OT_carAnimationRigGenerate,
+    OBJECT_OT_armatureCarDeformationRig,
+    POSE_OT_carAnimationAddBrakeWheelBones,
+    POSE_OT_carSetGround,
+    POSE_OT_carFollowPath,
+    POSE_OT_carClearFollowPathAnimation,
+)
+
+
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
+
+def register():
+    _register_classes()
+    
+    for name, create_property in SCENE_PROPERTIES:
+        setattr(bpy.types.Scene, name, create_property())
 
 
 def unregister():
     # Safely delete Scene properties if they exist
-    if hasattr(bpy.types.Scene, 'tq_follow_path_frame_end'):
-        del bpy.types.Scene.tq_follow_path_frame_end
-    if hasattr(bpy.types.Scene, 'tq_follow_path_frame_start'):
-        del bpy.types.Scene.tq_follow_path_frame_start
-    if hasattr(bpy.types.Scene, 'tq_follow_path_bake_wheels'):
-        del bpy.types.Scene.tq_follow_path_bake_wheels
-    if hasattr(bpy.types.Scene, 'tq_ground_object'):
-        del bpy.types.Scene.tq_ground_object
-    if hasattr(bpy.types.Scene, 'tq_adjust_origin'):
-        del bpy.types.Scene.tq_adjust_origin
-    if hasattr(bpy.types.Scene, 'tq_target_path_object'):
-        del bpy.types.Scene.tq_target_path_object
-    
-    bpy.utils.unregister_class(POSE_OT_carClearFollowPathAnimation)
-    bpy.utils.unregister_class(POSE_OT_carFollowPath)
-    bpy.utils.unregister_class(POSE_OT_carSetGround)
-    bpy.utils.unregister_class(POSE_OT_carAnimationAddBrakeWheelBones)
-    bpy.utils.unregister_class(OBJECT_OT_armatureCarDeformationRig)
-    bpy.utils.unregister_class(POSE_OT_carAnimationRigGenerate)
+    for name, _ in reversed(SCENE_PROPERTIES):
+        if hasattr(bpy.types.Scene, name):
+            delattr(bpy.types.Scene, name)
+
+    _unregister_classes()
 
 
 if __name__ == "__main__":
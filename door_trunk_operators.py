@@ -21,8 +21,10 @@
 import bpy
 import math
 import mathutils
+import numpy as np
 from rna_prop_ui import rna_idprop_ui_create
 from math import inf
+from . import widgets
 
 
 DOOR_TYPES = [
@@ -47,8 +49,7 @@ def get_widget(name):
     """Get or create a widget"""
     widget = bpy.data.objects.get(name)
     if widget is None:
-        from . import widgets as widgets_module
-        widgets_module.create()
+        widgets.create()
         widget = bpy.data.objects.get(name)
     return widget
 
@@ -59,7 +60,12 @@ def define_custom_property(target, name, value, description=None, overridable=Tr
                          overridable=overridable, min=-inf, max=inf)
 
 
-def create_door_bone(edit_bones, name, door_type, position_hint, parent_bone):
+def build_mesh_cache():
+    """List (object, lowercase name) pairs for every mesh object with a bounding box"""
+    return [(obj, obj.name.lower()) for obj in bpy.data.objects if obj.type == 'MESH' and obj.bound_box]
+
+
+def create_door_bone(edit_bones, name, door_type, position_hint, parent_bone, mesh_cache=None, arm_inv=None):
     """
     Create a door bone aligned to mesh bounding box Y-axis.
     Head is placed at y-max (highest Z corner), tail at y-min (lowest Z corner).
@@ -70,95 +76,91 @@ def create_door_bone(edit_bones, name, door_type, position_hint, parent_bone):
         door_type: 'MANUAL' or 'SLIDING'
         position_hint: Hint for placement (FL, FR, BL, BR for doors; F, B for trunks)
         parent_bone: Parent bone (DEF_Body)
+        mesh_cache: Result of build_mesh_cache(), built on demand if None
+        arm_inv: Inverted world matrix of the armature object, looked up if None
+    
+    Returns:
+        (door_bone, mesh_obj) where mesh_obj is the mesh the bone was fitted to when it
+        matched both 'door' and the position hint, otherwise None
     """
+    if mesh_cache is None:
+        mesh_cache = build_mesh_cache()
+    
+    # Position hint flags, evaluated once
+    is_left = 'L' in position_hint
+    is_front = 'F' in position_hint
+    is_trunk = name.startswith('Trunk')
+    
     def find_matching_mesh(bone_name, position_hint):
-        """Find mesh object matching door/trunk bone"""
-        is_trunk = bone_name.startswith('Trunk')
-        ph = position_hint.lower()
-        
-        # First pass: try exact match with position hint
-        for obj in bpy.data.objects:
-            if obj.type != 'MESH' or not obj.bound_box:
-                continue
-            
-            obj_name_lower = obj.name.lower()
-            
-            if is_trunk:
-                if 'trunk' in obj_name_lower:
-                    return obj
-            else:
-                # Door: prefer mesh with both 'door' and position hint
-                if 'door' in obj_name_lower and ph in obj_name_lower:
-                    return obj
-        
-        # Second pass: any mesh with relevant keyword
-        for obj in bpy.data.objects:
-            if obj.type != 'MESH' or not obj.bound_box:
-                continue
-            
-            obj_name_lower = obj.name.lower()
-            
-            if is_trunk and 'trunk' in obj_name_lower:
-                return obj
-            elif not is_trunk and 'door' in obj_name_lower:
-                return obj
+        """
+        Find mesh object matching door/trunk bone.
+        Returns (mesh_obj, position_match), position_match telling whether the
+        mesh matched both 'door' and the position hint.
+        """
+        if is_trunk:
+            # Trunk: first mesh with 'trunk' in its name
+            return next((obj for obj, obj_name_lower in mesh_cache if 'trunk' in obj_name_lower), None), False
         
-        return None
+        # Door: single pass returning the first mesh with both 'door' and
+        # position hint, otherwise the first mesh with 'door'
+        ph = position_hint.lower()
+        keyword_match = None
+        for obj, obj_name_lower in mesh_cache:
+            if 'door' in obj_name_lower:
+                if ph in obj_name_lower:
+                    return obj, True
+                if keyword_match is None:
+                    keyword_match = obj
+        
+        return keyword_match, False
     
-    def compute_bone_from_bbox(mesh_obj, armature_data, position_hint):
+    def compute_bone_from_bbox(mesh_obj, armature_data, position_hint, arm_inv=None):
         """
         Compute bone head/tail from mesh bounding box Y-axis.
         Head at y-max (highest Z on that face), tail at y-min (lowest Z on that face).
         For trunk B, head at y-min (highest Z on that face), tail at y-max (lowest Z on that face).
         Returns (head, tail) in armature-local space.
         """
-        # Get bounding box in world space
-        bbox_world = [mesh_obj.matrix_world @ mathutils.Vector(corner) for corner in mesh_obj.bound_box]
-        
-        # Find armature object to transform to its local space
-        arm_obj = None
-        for o in bpy.data.objects:
-            if o.type == 'ARMATURE' and o.data == armature_data:
-                arm_obj = o
-                break
-        
-        if arm_obj is None:
-            # No armature object found, use world coordinates
-            bbox_local = bbox_world
-        else:
-            # Transform to armature-local space
-            arm_inv = arm_obj.matrix_world.inverted()
-            bbox_local = [arm_inv @ p for p in bbox_world]
-        
-        # Extract Y values and find extremes
-        ys = [v.y for v in bbox_local]
-        max_y = max(ys)
-        min_y = min(ys)
-        
-        # Compute center X and Z for alignment
-        xs = [v.x for v in bbox_local]
-        zs = [v.z for v in bbox_local]
-        center_x = sum(xs) / len(xs)
-        center_z = sum(zs) / len(zs)
+        if arm_inv is None:
+            # Find armature object to transform to its local space
+            for o in bpy.data.objects:
+                if o.type == 'ARMATURE' and o.data == armature_data:
+                    arm_inv = o.matrix_world.inverted()
+                    break
+        
+        # Bounding box corners as homogeneous coordinates
+        corners = np.empty((8, 4))
+        corners[:, :3] = np.asarray(mesh_obj.bound_box, dtype=np.float64)
+        corners[:, 3] = 1.0
+        
+        # Single 4x4 transform from mesh space to armature-local space
+        # (world space if no armature object is found)
+        matrix = np.asarray(mesh_obj.matrix_world, dtype=np.float64)
+        if arm_inv is not None:
+            matrix = np.asarray(arm_inv, dtype=np.float64) @ matrix
+        bbox_local = (corners @ matrix.T)[:, :3]
+        
+        # Find Y extremes and center X and Z for alignment
+        bbox_min = bbox_local.min(axis=0)
+        bbox_max = bbox_local.max(axis=0)
+        bbox_center = bbox_local.mean(axis=0)
+        max_y = bbox_max[1]
+        min_y = bbox_min[1]
+        center_x = bbox_center[0]
+        center_z = bbox_center[2]
         
         # Gather corners at y-max and y-min faces
         eps = 1e-6
-        y_max_points = [v for v in bbox_local if abs(v.y - max_y) <= eps]
-        y_min_points = [v for v in bbox_local if abs(v.y - min_y) <= eps]
+        y_max_mask = np.abs(bbox_local[:, 1] - max_y) <= eps
+        y_min_mask = np.abs(bbox_local[:, 1] - min_y) <= eps
         
         # Head: y-max face, highest Z corner
-        if y_max_points:
-            highest_z = max(y_max_points, key=lambda v: v.z).z
-            head = mathutils.Vector((center_x, max_y, highest_z))
-        else:
-            head = mathutils.Vector((center_x, max_y, center_z))
+        highest_z = bbox_local[y_max_mask, 2].max() if y_max_mask.any() else center_z
+        head = mathutils.Vector((center_x, max_y, highest_z))
         
         # Tail: y-min face, lowest Z corner
-        if y_min_points:
-            lowest_z = min(y_min_points, key=lambda v: v.z).z
-            tail = mathutils.Vector((center_x, min_y, lowest_z))
-        else:
-            tail = mathutils.Vector((center_x, min_y, center_z))
+        lowest_z = bbox_local[y_min_mask, 2].min() if y_min_mask.any() else center_z
+        tail = mathutils.Vector((center_x, min_y, lowest_z))
         
         # Ensure head is above tail (swap if needed)
         if head.z < tail.z:
@@ -170,42 +172,38 @@ def create_door_bone(edit_bones, name, door_type, position_hint, parent_bone):
     door_bone = edit_bones.new(name)
     
     # Try to find matching mesh and compute bone from it
-    mesh_obj = find_matching_mesh(name, position_hint)
+    mesh_obj, position_match = find_matching_mesh(name, position_hint)
     
     if mesh_obj:
-        head, tail = compute_bone_from_bbox(mesh_obj, parent_bone.id_data, position_hint)
+        head, tail = compute_bone_from_bbox(mesh_obj, parent_bone.id_data, position_hint, arm_inv)
         door_bone.head = head
         door_bone.tail = tail
         door_bone.roll = 0.0
     else:
         # Fallback: use parent body dimensions
-        body_center = parent_bone.head.copy()
+        body_center = parent_bone.head
         body_length = (parent_bone.tail - parent_bone.head).length
         
-        is_left = 'L' in position_hint
-        is_front = 'F' in position_hint
-        is_trunk = name.startswith('Trunk')
-        
         if is_trunk:
             # Trunk positioning
             if is_front:
-                door_bone.head = mathutils.Vector((body_center.x, body_center.y + body_length * 0.4, body_center.z + 0.3))
-                door_bone.tail = mathutils.Vector((body_center.x, body_center.y + body_length * 0.4 - 0.5, body_center.z + 0.1))
+                door_bone.head = (body_center.x, body_center.y + body_length * 0.4, body_center.z + 0.3)
+                door_bone.tail = (body_center.x, body_center.y + body_length * 0.4 - 0.5, body_center.z + 0.1)
             else:
-                door_bone.head = mathutils.Vector((body_center.x, body_center.y - body_length * 0.4, body_center.z + 0.3))
-                door_bone.tail = mathutils.Vector((body_center.x, body_center.y - body_length * 0.4 + 0.5, body_center.z + 0.1))
+                door_bone.head = (body_center.x, body_center.y - body_length * 0.4, body_center.z + 0.3)
+                door_bone.tail = (body_center.x, body_center.y - body_length * 0.4 + 0.5, body_center.z + 0.1)
         else:
             # Door positioning
             side_offset = 0.8 if is_left else -0.8
             front_back_offset = 0.3 if is_front else -0.3
             
-            door_bone.head = mathutils.Vector((body_center.x + side_offset, body_center.y + front_back_offset + 0.3, body_center.z + 0.4))
-            door_bone.tail = mathutils.Vector((body_center.x + side_offset, body_center.y + front_back_offset - 0.3, body_center.z + 0.1))
+            door_bone.head = (body_center.x + side_offset, body_center.y + front_back_offset + 0.3, body_center.z + 0.4)
+            door_bone.tail = (body_center.x + side_offset, body_center.y + front_back_offset - 0.3, body_center.z + 0.1)
     
     door_bone.use_deform = False
     door_bone.parent = parent_bone
     
-    return door_bone
+    return door_bone, (mesh_obj if position_match else None)
 
 
 def setup_door_constraints(obj, door_bone_name, door_type, position_hint):
@@ -222,8 +220,9 @@ def setup_door_constraints(obj, door_bone_name, door_type, position_hint):
     
     # Determine rotation axis based on position
     is_left = 'L' in position_hint
+    is_front = 'F' in position_hint
     is_trunk = door_bone_name.startswith('Trunk')
-    is_front_trunk = is_trunk and 'F' in position_hint
+    is_front_trunk = is_trunk and is_front
     
     if door_type == 'MANUAL':
         # Manual door - rotation constraint
@@ -297,14 +296,9 @@ def assign_door_widget(obj, door_bone_name):
 def assign_bone_to_collection(armature, bone_name, collection_name):
     """Assign bone to a specific bone collection"""
     bone = armature.bones[bone_name]
-    collection = None
     
     # Find or create collection
-    for coll in armature.collections:
-        if coll.name == collection_name:
-            collection = coll
-            break
-    
+    collection = armature.collections.get(collection_name)
     if collection is None:
         collection = armature.collections.new(name=collection_name)
         collection.is_visible = True  # Layer 5 is visible
@@ -312,55 +306,48 @@ def assign_bone_to_collection(armature, bone_name, collection_name):
     collection.assign(bone)
 
 
-def parent_meshes_to_bone(armature_obj, bone_name):
+def get_scene_meshes(scene):
+    """List the mesh objects of the scene"""
+    return [obj for obj in scene.objects if obj.type == 'MESH']
+
+
+def parent_meshes_to_bone(armature_obj, bone_name, extra_meshes=()):
     """
     Find and parent any mesh objects matching the bone name to that bone.
-    Searches for meshes with names containing the bone name.
+    Searches for meshes with names containing the bone name, and also parents
+    extra_meshes (e.g. the mesh the bone was fitted to) if not already matched.
     """
-    import bpy
+    scene = bpy.context.scene
     
     # Find matching meshes
-    matching_meshes = []
-    for obj in bpy.context.scene.objects:
-        if obj.type == 'MESH' and bone_name in obj.name:
+    matching_meshes = [obj for obj in get_scene_meshes(scene) if bone_name in obj.name]
+    for obj in extra_meshes:
+        # Only objects linked to the scene can be selected for parenting
+        if obj not in matching_meshes and obj.name in scene.objects:
             matching_meshes.append(obj)
     
     if not matching_meshes:
         return 0
     
-    # Parent each mesh to the bone
-    parented_count = 0
-    for mesh_obj in matching_meshes:
-        # Deselect all
-        bpy.ops.object.select_all(action='DESELECT')
-        
-        # Select mesh and armature
-        mesh_obj.select_set(True)
-        armature_obj.select_set(True)
-        bpy.context.view_layer.objects.active = armature_obj
-        
-        # Enter pose mode
-        bpy.ops.object.mode_set(mode='POSE')
-        
-        # Select the bone
-        for pose_bone in armature_obj.pose.bones:
-            pose_bone.bone.select = False
-        armature_obj.pose.bones[bone_name].bone.select = True
-        bpy.context.view_layer.objects.active = armature_obj
-        
-        # Parent with automatic weights
-        try:
-            bpy.ops.object.mode_set(mode='OBJECT')
-            bpy.context.view_layer.objects.active = mesh_obj
-            mesh_obj.select_set(True)
-            bpy.context.view_layer.objects.active = armature_obj
-            armature_obj.select_set(True)
+    # Parent all meshes in one operator call, from a single mode switch
+    if armature_obj.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    
+    # Select the bone
+    bones = armature_obj.data.bones
+    bones.foreach_set('select', [False] * len(bones))
+    bones[bone_name].select = True
+    
+    # Parent with automatic weights, meshes and armature selected, armature active
+    selected = matching_meshes + [armature_obj]
+    try:
+        with bpy.context.temp_override(active_object=armature_obj, object=armature_obj,
+                                       selected_objects=selected, selected_editable_objects=selected):
             bpy.ops.object.parent_set(type='ARMATURE_AUTO')
-            parented_count += 1
-        except:
-            pass
+    except:
+        return 0
     
-    return parented_count
+    return len(matching_meshes)
 
 
 class POSE_OT_addDoor(bpy.types.Operator):
@@ -417,6 +404,10 @@ class POSE_OT_addDoor(bpy.types.Operator):
             self.report({'WARNING'}, f'Door {door_name} already exists')
             return {'CANCELLED'}
         
+        # Index mesh objects once for this call
+        mesh_cache = build_mesh_cache()
+        arm_inv = obj.matrix_world.inverted_safe()
+        
         # Switch to edit mode to create bone
         current_mode = obj.mode
         bpy.ops.object.mode_set(mode='EDIT')
@@ -426,8 +417,9 @@ class POSE_OT_addDoor(bpy.types.Operator):
             parent_bone = edit_bones['DEF_Body']
             
             # Create door bone
-            create_door_bone(edit_bones, door_name, self.door_type, 
-                           self.door_position, parent_bone)
+            _, mesh_obj = create_door_bone(edit_bones, door_name, self.door_type, 
+                                           self.door_position, parent_bone, mesh_cache=mesh_cache,
+                                           arm_inv=arm_inv)
             
             # Switch to pose mode for constraints
             bpy.ops.object.mode_set(mode='POSE')
@@ -443,8 +435,9 @@ class POSE_OT_addDoor(bpy.types.Operator):
             assign_bone_to_collection(obj.data, door_name, 'Layer 5')
             assign_bone_to_collection(obj.data, door_name, 'DoorTrunk')
             
-            # Try to parent matching meshes
-            parented = parent_meshes_to_bone(obj, door_name)
+            # Try to parent matching meshes, along with the mesh the bone was fitted to
+            extra_meshes = (mesh_obj,) if mesh_obj is not None else ()
+            parented = parent_meshes_to_bone(obj, door_name, extra_meshes=extra_meshes)
             if parented > 0:
                 self.report({'INFO'}, f'Created {door_name} ({self.door_type}) - parented {parented} mesh(es)')
             else:
@@ -510,6 +503,10 @@ class POSE_OT_addTrunk(bpy.types.Operator):
             self.report({'WARNING'}, f'Trunk {trunk_name} already exists')
             return {'CANCELLED'}
         
+        # Index mesh objects once for this call
+        mesh_cache = build_mesh_cache()
+        arm_inv = obj.matrix_world.inverted_safe()
+        
         # Switch to edit mode to create bone
         current_mode = obj.mode
         bpy.ops.object.mode_set(mode='EDIT')
@@ -519,8 +516,9 @@ class POSE_OT_addTrunk(bpy.types.Operator):
             parent_bone = edit_bones['DEF_Body']
             
             # Create trunk bone
-            create_door_bone(edit_bones, trunk_name, self.trunk_type, 
-                           self.trunk_position, parent_bone)
+            _, mesh_obj = create_door_bone(edit_bones, trunk_name, self.trunk_type, 
+                                           self.trunk_position, parent_bone, mesh_cache=mesh_cache,
+                                           arm_inv=arm_inv)
             
             # Switch to pose mode for constraints
             bpy.ops.object.mode_set(mode='POSE')
@@ -536,8 +534,9 @@ class POSE_OT_addTrunk(bpy.types.Operator):
             assign_bone_to_collection(obj.data, trunk_name, 'Layer 5')
             assign_bone_to_collection(obj.data, trunk_name, 'DoorTrunk')
             
-            # Try to parent matching meshes
-            parented = parent_meshes_to_bone(obj, trunk_name)
+            # Try to parent matching meshes, along with the mesh the bone was fitted to
+            extra_meshes = (mesh_obj,) if mesh_obj is not None else ()
+            parented = parent_meshes_to_bone(obj, trunk_name, extra_meshes=extra_meshes)
             if parented > 0:
                 self.report({'INFO'}, f'Created {trunk_name} ({self.trunk_type}) - parented {parented} mesh(es)')
             else:
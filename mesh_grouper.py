@@ -19,38 +19,96 @@
 # <pep8 compliant>
 
 import bpy
-from typing import List, Optional
+import functools
+import os
+import re
+import numpy as np
+from mathutils import Matrix, Vector
+from bpy.app.handlers import persistent
+from typing import List, Optional, Tuple
+
+# Rig groups as panel sections of (heading, icon, button rows),
+# each button a (text, group label, suffix) triple
+_LAYOUT = (
+    ("Assign to Rig Group:", 'ARMATURE_DATA', (
+        (("Body", 'Body', 'Body'),),
+        (("Wheel FL", 'Wheel Front Left', 'Wheel_FL_0'),
+         ("Wheel FR", 'Wheel Front Right', 'Wheel_FR_0'),
+         ("Wheel BL", 'Wheel Back Left', 'Wheel_BL_0'),
+         ("Wheel BR", 'Wheel Back Right', 'Wheel_BR_0')),
+        (("Wheel BL Extra", 'Wheel Back Left Extra', 'Wheel_BL_1'),
+         ("Wheel BR Extra", 'Wheel Back Right Extra', 'Wheel_BR_1')),
+        (("Brake FL", 'WheelBrake Front Left', 'Brake_FL_0'),
+         ("Brake FR", 'WheelBrake Front Right', 'Brake_FR_0'),
+         ("Brake BL", 'WheelBrake Back Left', 'Brake_BL_0'),
+         ("Brake BR", 'WheelBrake Back Right', 'Brake_BR_0')),
+        (("Brake BL Extra", 'WheelBrake Back Left Extra', 'Brake_BL_1'),
+         ("Brake BR Extra", 'WheelBrake Back Right Extra', 'Brake_BR_1')),
+        (("Steering", 'Steering', 'Steering'),),
+    )),
+    ("Doors:", 'OUTLINER_DATA_ARMATURE', (
+        (("Door FL", 'Door Front Left', 'Door_FL_0'),
+         ("Door FR", 'Door Front Right', 'Door_FR_0')),
+        (("Door BL", 'Door Back Left', 'Door_BL_0'),
+         ("Door BR", 'Door Back Right', 'Door_BR_0')),
+    )),
+    ("Trunks:", 'OUTLINER_DATA_ARMATURE', (
+        (("Trunk Front", 'Trunk Front', 'Trunk_F_0'),
+         ("Trunk Back", 'Trunk Back', 'Trunk_B_0')),
+    )),
+)
 
 # Available rig groups with their suffixes
 RIG_GROUPS = {
-    'Body': 'Body',
-    'Wheel Front Left': 'Wheel_FL_0',
-    'Wheel Front Right': 'Wheel_FR_0',
-    'Wheel Back Left': 'Wheel_BL_0',
-    'Wheel Back Right': 'Wheel_BR_0',
-    'Wheel Back Left Extra': 'Wheel_BL_1',
-    'Wheel Back Right Extra': 'Wheel_BR_1',
-    'WheelBrake Front Left': 'Brake_FL_0',
-    'WheelBrake Front Right': 'Brake_FR_0',
-    'WheelBrake Back Left': 'Brake_BL_0',
-    'WheelBrake Back Right': 'Brake_BR_0',
-    'WheelBrake Back Left Extra': 'Brake_BL_1',
-    'WheelBrake Back Right Extra': 'Brake_BR_1',
-    'Steering': 'Steering',
-    'Door Front Left': 'Door_FL_0',
-    'Door Front Right': 'Door_FR_0',
-    'Door Back Left': 'Door_BL_0',
-    'Door Back Right': 'Door_BR_0',
-    'Trunk Front': 'Trunk_F_0',
-    'Trunk Back': 'Trunk_B_0',
+    group_label: suffix
+    for _, _, rows in _LAYOUT
+    for buttons in rows
+    for _, group_label, suffix in buttons
 }
 
+# Mesh name without its trailing .00X duplicate suffix
+_BASE_NAME_RE = re.compile(r'^(.*?)(?:\.\d+)?$')
+# Rig group suffix ending with an index, like Wheel_FR_0
+_SUFFIX_NUM_RE = re.compile(r'^(.+)_(\d+)$')
+
 
 def get_selected_meshes(context) -> List[bpy.types.Object]:
     """Get all selected mesh objects"""
     return [obj for obj in context.selected_objects if obj.type == 'MESH']
 
 
+# Selected meshes shared by the panel and the group operators polls between redraws
+_selected_meshes_cache = {'key': None, 'meshes': ()}
+
+
+def get_cached_selected_meshes(context) -> Tuple[bpy.types.Object, ...]:
+    """
+    Get all selected mesh objects for UI code (panel draw, operators poll).
+    The result is reused until the selection changes or the depsgraph is updated.
+    """
+    selected = context.selected_objects
+    key = (context.view_layer.as_pointer(), len(selected),
+           selected[0].name if selected else None, selected[-1].name if selected else None)
+    if _selected_meshes_cache['key'] != key:
+        _selected_meshes_cache['meshes'] = tuple(obj for obj in selected if obj.type == 'MESH')
+        _selected_meshes_cache['key'] = key
+    return _selected_meshes_cache['meshes']
+
+
+@persistent
+def _invalidate_selected_meshes_cache(*args):
+    _selected_meshes_cache['key'] = None
+    _selected_meshes_cache['meshes'] = ()
+
+
+_CACHE_INVALIDATION_HANDLERS = (
+    bpy.app.handlers.depsgraph_update_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
 def get_base_mesh_name(mesh_name: str) -> str:
     """
     Extract base name from mesh.
@@ -60,97 +118,134 @@ def get_base_mesh_name(mesh_name: str) -> str:
     - 'bmw-z4.002' -> 'bmw-z4'
     """
     # Remove trailing .00X suffixes
-    import re
-    match = re.match(r'^(.*?)(?:\.\d+)?$', mesh_name)
+    match = _BASE_NAME_RE.match(mesh_name)
     return match.group(1) if match else mesh_name
 
 
+@functools.lru_cache(maxsize=128)
+def compute_prefix(prefix_source: str, filepath: str, mesh_name: str, custom_prefix: str) -> str:
+    """Name prefix of the combined object, cached on all of its inputs"""
+    if prefix_source == 'BLEND':
+        if filepath:
+            return os.path.splitext(os.path.basename(filepath))[0]
+        return "Untitled"
+    elif prefix_source == 'CUSTOM':
+        return custom_prefix or get_base_mesh_name(mesh_name)
+    else:  # MESH
+        return get_base_mesh_name(mesh_name)
+
+
 def join_meshes_and_set_origin(meshes: List[bpy.types.Object], context, name: str):
     """Join multiple meshes together and set origin to grouped geometry"""
-    # Deselect all first
-    bpy.ops.object.select_all(action='DESELECT')
+    # Join all meshes (Ctrl+J) into the first one, overriding the selection
+    # instead of deselecting and reselecting every object
+    with context.temp_override(active_object=meshes[0], object=meshes[0],
+                               selected_objects=meshes, selected_editable_objects=meshes):
+        bpy.ops.object.join()
     
-    # Select all meshes
-    for mesh in meshes:
-        mesh.select_set(True)
-    
-    # Set first mesh as active (required for join operation)
-    context.view_layer.objects.active = meshes[0]
-    
-    # Join all meshes (Ctrl+J)
-    bpy.ops.object.join()
-    
-    # The joined object is now the active object (first mesh)
-    joined_object = context.view_layer.objects.active
+    # The joined object is the first mesh, made active as the previous active
+    # object may have been removed by the join
+    joined_object = meshes[0]
     joined_object.name = name
+    context.view_layer.objects.active = joined_object
     
-    # Set origin to geometry
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY')
+    # Deselect the combined object, the only selected mesh left after the join,
+    # so it is not joined into the next group
+    joined_object.select_set(False)
     
-    # Deselect all
-    bpy.ops.object.select_all(action='DESELECT')
+    # Set origin to geometry (median of the vertices), read in bulk from the mesh
+    # instead of going through the origin_set operator
+    joined_mesh = joined_object.data
+    nb_verts = len(joined_mesh.vertices)
+    if nb_verts:
+        co = np.empty(nb_verts * 3, dtype=np.float32)
+        joined_mesh.vertices.foreach_get('co', co)
+        centroid = Vector(co.reshape(-1, 3).mean(axis=0, dtype=np.float64))
+        joined_mesh.transform(Matrix.Translation(-centroid), shape_keys=True)
+        joined_object.matrix_world.translation = joined_object.matrix_world @ centroid
+        # Like origin_set, keep children in place by offsetting their parent inverse
+        child_offset = Matrix.Translation(-centroid)
+        for child in joined_object.children:
+            child.matrix_parent_inverse = child_offset @ child.matrix_parent_inverse
     
     return joined_object
 
 
-# Dynamically create operators for each rig group
-def create_group_operator(group_label: str, suffix: str):
-    class MESH_GROUPER_OT_group(bpy.types.Operator):
-        bl_idname = f"mesh_grouper.group_{suffix.lower().replace('.', '_')}"
-        bl_label = f"Assign to {group_label}"
-        bl_options = {'REGISTER', 'UNDO'}
+def _decode_group_suffix(suffix: str) -> Optional[Tuple[str, int]]:
+    """Split an indexed suffix like Wheel_FR_0 into ('Wheel_FR', 0), None otherwise"""
+    suffix_match = _SUFFIX_NUM_RE.match(suffix)
+    if suffix_match is None:
+        return None
+    return suffix_match.group(1), int(suffix_match.group(2))
+
+
+# Rig group label and decoded index per suffix, computed once at import
+_GROUP_LABELS = {suffix: group_label for group_label, suffix in RIG_GROUPS.items()}
+_GROUP_SUFFIX_INDEX = {suffix: _decode_group_suffix(suffix) for suffix in _GROUP_LABELS}
+
+
+class MESH_GROUPER_OT_group(bpy.types.Operator):
+    """Combine the selected meshes into one object named after a rig group"""
+    bl_idname = "mesh_grouper.group"
+    bl_label = "Assign to Rig Group"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    suffix: bpy.props.StringProperty(
+        name="Suffix",
+        description="Rig group suffix of the combined object name",
+        options={'HIDDEN'}
+    )
+    
+    @classmethod
+    def description(cls, context, properties):
+        return f"Assign to {_GROUP_LABELS.get(properties.suffix, 'rig group')}"
+    
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and len(get_cached_selected_meshes(context)) > 0
+    
+    def execute(self, context):
+        suffix = self.suffix
+        if suffix not in _GROUP_LABELS:
+            self.report({'ERROR'}, f"Unknown rig group suffix '{suffix}'")
+            return {'CANCELLED'}
         
-        @classmethod
-        def poll(cls, context):
-            return context.mode == 'OBJECT' and len(get_selected_meshes(context)) > 0
+        selected_meshes = get_selected_meshes(context)
         
-        def execute(self, context):
-            selected_meshes = get_selected_meshes(context)
-            
-            if not selected_meshes:
-                self.report({'WARNING'}, "No meshes selected")
-                return {'CANCELLED'}
-            
-            # Get prefix based on source
-            if context.scene.prefix_source == 'BLEND':
-                import os
-                if bpy.data.filepath:
-                    prefix = os.path.splitext(os.path.basename(bpy.data.filepath))[0]
-                else:
-                    prefix = "Untitled"
-            elif context.scene.prefix_source == 'CUSTOM':
-                prefix = context.scene.custom_prefix or get_base_mesh_name(selected_meshes[0].name)
-            else:  # MESH
-                prefix = get_base_mesh_name(selected_meshes[0].name)
-            
-            # Create combined object name with auto-increment for duplicates
-            base_name = f"{prefix}_{suffix}"
-            combined_name = base_name
-            
-            # If the suffix ends with a number (like Wheel_FR_0), increment it
-            import re
-            match = re.match(r'^(.+)_(\d+)$', suffix)
-            if match:
-                base_suffix = match.group(1)
-                start_num = int(match.group(2))
-                counter = start_num
-                while bpy.data.objects.get(combined_name) is not None:
-                    counter += 1
-                    combined_name = f"{prefix}_{base_suffix}_{counter}"
-            else:
-                # For non-numbered suffixes (like Body), just ensure uniqueness
-                counter = 1
-                while bpy.data.objects.get(combined_name) is not None:
-                    combined_name = f"{base_name}_{counter}"
-                    counter += 1
-            
-            # Join all selected meshes and set origin
-            join_meshes_and_set_origin(selected_meshes, context, combined_name)
-            
-            self.report({'INFO'}, f"Combined {len(selected_meshes)} mesh(es) into {combined_name}")
-            return {'FINISHED'}
-    
-    return MESH_GROUPER_OT_group
+        if not selected_meshes:
+            self.report({'WARNING'}, "No meshes selected")
+            return {'CANCELLED'}
+        
+        # Get prefix based on source
+        prefix = compute_prefix(context.scene.prefix_source, bpy.data.filepath,
+                                selected_meshes[0].name, context.scene.custom_prefix)
+        
+        # Create combined object name with auto-increment for duplicates
+        base_name = f"{prefix}_{suffix}"
+        combined_name = base_name
+        
+        # Snapshot object names once instead of probing bpy.data.objects per candidate
+        existing_names = {obj.name for obj in bpy.data.objects}
+        
+        # If the suffix ends with a number (like Wheel_FR_0), increment it
+        suffix_index = _GROUP_SUFFIX_INDEX[suffix]
+        if suffix_index is not None:
+            base_suffix, counter = suffix_index
+            while combined_name in existing_names:
+                counter += 1
+                combined_name = f"{prefix}_{base_suffix}_{counter}"
+        else:
+            # For non-numbered suffixes (like Body), just ensure uniqueness
+            counter = 1
+            while combined_name in existing_names:
+                combined_name = f"{base_name}_{counter}"
+                counter += 1
+        
+        # Join all selected meshes and set origin
+        join_meshes_and_set_origin(selected_meshes, context, combined_name)
+        
+        self.report({'INFO'}, f"Combined {len(selected_meshes)} mesh(es) into {combined_name}")
+        return {'FINISHED'}
 
 
 class MESH_GROUPER_PT_mesh_grouping(bpy.types.Panel):
@@ -170,7 +265,7 @@ class MESH_GROUPER_PT_mesh_grouping(bpy.types.Panel):
         layout.use_property_split = False
         layout.use_property_decorate = False
         
-        selected_meshes = get_selected_meshes(context)
+        selected_meshes = get_cached_selected_meshes(context)
         
         if selected_meshes:
             # Show selected mesh info
@@ -182,89 +277,47 @@ class MESH_GROUPER_PT_mesh_grouping(bpy.types.Panel):
             if len(selected_meshes) > 5:
                 col.label(text=f"  ... and {len(selected_meshes) - 5} more", icon='DOT')
             
-            # Base name
-            base_name = get_base_mesh_name(selected_meshes[0].name)
-            box.separator()
-            box.label(text=f"Base Name: '{base_name}'", icon='INFO')
+            scene = context.scene
+            prefix_source = scene.prefix_source
+            
+            # Base name, used as the prefix for the mesh name source and as the
+            # fallback of an empty custom prefix
+            if prefix_source == 'MESH' or (prefix_source == 'CUSTOM' and not scene.custom_prefix):
+                base_name = get_base_mesh_name(selected_meshes[0].name)
+                box.separator()
+                box.label(text=f"Base Name: '{base_name}'", icon='INFO')
             
             # Prefix source selection
             box.separator()
-            box.prop(context.scene, "prefix_source")
+            box.prop(scene, "prefix_source")
             
             # Custom prefix input (only show if CUSTOM selected)
-            if context.scene.prefix_source == 'CUSTOM':
-                box.prop(context.scene, "custom_prefix")
+            if prefix_source == 'CUSTOM':
+                box.prop(scene, "custom_prefix")
             
             # Rig group buttons
-            box.separator()
-            box.label(text="Assign to Rig Group:", icon='ARMATURE_DATA')
-            
-            # Body button
-            row = box.row()
-            row.operator("mesh_grouper.group_body", text="Body")
-            
-            # Wheel buttons on one line
-            row = box.row()
-            row.operator("mesh_grouper.group_wheel_fl_0", text="Wheel FL")
-            row.operator("mesh_grouper.group_wheel_fr_0", text="Wheel FR")
-            row.operator("mesh_grouper.group_wheel_bl_0", text="Wheel BL")
-            row.operator("mesh_grouper.group_wheel_br_0", text="Wheel BR")
-            
-            # Extra back wheel buttons on one line
-            row = box.row()
-            row.operator("mesh_grouper.group_wheel_bl_1", text="Wheel BL Extra")
-            row.operator("mesh_grouper.group_wheel_br_1", text="Wheel BR Extra")
-            
-            # WheelBrake buttons on one line
-            row = box.row()
-            row.operator("mesh_grouper.group_brake_fl_0", text="Brake FL")
-            row.operator("mesh_grouper.group_brake_fr_0", text="Brake FR")
-            row.operator("mesh_grouper.group_brake_bl_0", text="Brake BL")
-            row.operator("mesh_grouper.group_brake_br_0", text="Brake BR")
-            
-            # Extra back WheelBrake buttons on one line
-            row = box.row()
-            row.operator("mesh_grouper.group_brake_bl_1", text="Brake BL Extra")
-            row.operator("mesh_grouper.group_brake_br_1", text="Brake BR Extra")
-            
-            # Steering button
-            row = box.row()
-            row.operator("mesh_grouper.group_steering", text="Steering")
-            
-            # Door buttons
-            box.separator()
-            box.label(text="Doors:", icon='OUTLINER_DATA_ARMATURE')
-            row = box.row()
-            row.operator("mesh_grouper.group_door_fl_0", text="Door FL")
-            row.operator("mesh_grouper.group_door_fr_0", text="Door FR")
-            row = box.row()
-            row.operator("mesh_grouper.group_door_bl_0", text="Door BL")
-            row.operator("mesh_grouper.group_door_br_0", text="Door BR")
-            
-            # Trunk buttons
-            box.separator()
-            box.label(text="Trunks:", icon='OUTLINER_DATA_ARMATURE')
-            row = box.row()
-            row.operator("mesh_grouper.group_trunk_f_0", text="Trunk Front")
-            row.operator("mesh_grouper.group_trunk_b_0", text="Trunk Back")
+            for heading, icon, rows in _LAYOUT:
+                box.separator()
+                box.label(text=heading, icon=icon)
+                for buttons in rows:
+                    row = box.row()
+                    for text, _, suffix in buttons:
+                        row.operator("mesh_grouper.group", text=text).suffix = suffix
         else:
             box = layout.box()
             box.label(text="Select meshes to assign to rig groups", icon='INFO')
 
 
-# Create operator classes for all rig groups
-_operator_classes = [MESH_GROUPER_PT_mesh_grouping]
-for group_label, suffix in RIG_GROUPS.items():
-    operator_class = create_group_operator(group_label, suffix)
-    _operator_classes.append(operator_class)
+classes = (
+    MESH_GROUPER_OT_group,
+    MESH_GROUPER_PT_mesh_grouping,
+)
 
-classes = tuple(_operator_classes)
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
 
-def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
-    
+
+def _register_props():
     # Add prefix source property to Scene
     bpy.types.Scene.prefix_source = bpy.props.EnumProperty(
         name="Prefix Source",
@@ -285,10 +338,23 @@ def register():
     )
 
 
-def unregister():
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
-    
+def _unregister_props():
     # Remove properties from Scene
     del bpy.types.Scene.prefix_source
     del bpy.types.Scene.custom_prefix
+
+
+def register():
+    _register_classes()
+    _register_props()
+    for handlers in _CACHE_INVALIDATION_HANDLERS:
+        handlers.append(_invalidate_selected_meshes_cache)
+
+
+def unregister():
+    for handlers in _CACHE_INVALIDATION_HANDLERS:
+        if _invalidate_selected_meshes_cache in handlers:
+            handlers.remove(_invalidate_selected_meshes_cache)
+    _invalidate_selected_meshes_cache()
+    _unregister_classes()
+    _unregister_props()
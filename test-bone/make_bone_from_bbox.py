@@ -12,9 +12,89 @@ Usage:
 - Or run Blender from the command line: `blender --background --python make_bone_from_bbox.py`
 """
 
+import os
 import bpy
+import numpy as np
 from mathutils import Vector
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional (Blender does not ship it), NumPy is used otherwise
+    njit = None
+
+
+# Tolerance for a corner to count as lying on the y-max / y-min face
+BBOX_FACE_EPS = 1e-6
+
+
+def _bbox_reduce_loops(arr):
+    """Reduce (N, 8, 3) world bbox corners to (N, 6) rows of
+    (min_y, max_y, center_x, center_z, top_z_at_ymax, bot_z_at_ymin).
+    Written as explicit loops so it compiles with Numba's njit.
+    """
+    n = arr.shape[0]
+    out = np.empty((n, 6))
+    for i in range(n):
+        min_y = arr[i, 0, 1]
+        max_y = min_y
+        sum_x = 0.0
+        sum_z = 0.0
+        for j in range(8):
+            y = arr[i, j, 1]
+            if y < min_y:
+                min_y = y
+            if y > max_y:
+                max_y = y
+            sum_x += arr[i, j, 0]
+            sum_z += arr[i, j, 2]
+        center_x = sum_x / 8.0
+        center_z = sum_z / 8.0
+
+        # Most extreme Z among the corners on each face. bound_box always has
+        # 8 corners, so the corners reaching max_y / min_y are on these faces.
+        top_z = -np.inf
+        bot_z = np.inf
+        for j in range(8):
+            y = arr[i, j, 1]
+            z = arr[i, j, 2]
+            if abs(y - max_y) <= BBOX_FACE_EPS and z > top_z:
+                top_z = z
+            if abs(y - min_y) <= BBOX_FACE_EPS and z < bot_z:
+                bot_z = z
+
+        out[i, 0] = min_y
+        out[i, 1] = max_y
+        out[i, 2] = center_x
+        out[i, 3] = center_z
+        out[i, 4] = top_z
+        out[i, 5] = bot_z
+    return out
+
+
+def _bbox_reduce_numpy(arr):
+    """Vectorized NumPy equivalent of _bbox_reduce_loops, used without Numba."""
+    ys = arr[:, :, 1]
+    zs = arr[:, :, 2]
+    max_y = ys.max(axis=1)
+    min_y = ys.min(axis=1)
+    center = arr.mean(axis=1)
+
+    # Most extreme Z among the corners on each face
+    top_z = np.where(np.abs(ys - max_y[:, np.newaxis]) <= BBOX_FACE_EPS, zs, -np.inf).max(axis=1)
+    bot_z = np.where(np.abs(ys - min_y[:, np.newaxis]) <= BBOX_FACE_EPS, zs, np.inf).min(axis=1)
+
+    return np.column_stack((min_y, max_y, center[:, 0], center[:, 2], top_z, bot_z))
+
+
+if njit is None:
+    _bbox_reduce = _bbox_reduce_numpy
+else:
+    # Numba's on-disk cache needs a real source file, which a script run from
+    # the Text Editor does not have
+    _script_file = globals().get('__file__')
+    _bbox_reduce = njit(cache=bool(_script_file) and os.path.isfile(_script_file))(_bbox_reduce_loops)
+
 
 def main():
     obj = bpy.context.active_object
@@ -26,38 +106,18 @@ def main():
         return
 
     # Get bounding-box corners in world space
-    bbox_world = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-
-    ys = [v.y for v in bbox_world]
-
-    max_y = max(ys)
-    min_y = min(ys)
-
-    # compute center X/Z so bone has no X variance (aligned straight on Y axis)
-    xs = [v.x for v in bbox_world]
-    zs = [v.z for v in bbox_world]
-    center_x = sum(xs) / len(xs)
-    center_z = sum(zs) / len(zs)
-
-    # Gather corners that lie on the y-max and y-min faces (use epsilon for safety)
-    eps = 1e-6
-    y_max_points = [v for v in bbox_world if abs(v.y - max_y) <= eps]
-    y_min_points = [v for v in bbox_world if abs(v.y - min_y) <= eps]
-
-    # Choose the corner on each face with the most extreme Z (head -> highest Z, tail -> lowest Z)
-    if y_max_points:
-        highest_z = max(y_max_points, key=lambda v: v.z).z
-        head_world = Vector((center_x, max_y, highest_z))
-    else:
-        # fallback to face center (use center_z)
-        head_world = Vector((center_x, max_y, center_z))
-
-    if y_min_points:
-        lowest_z = min(y_min_points, key=lambda v: v.z).z
-        tail_world = Vector((center_x, min_y, lowest_z))
-    else:
-        # fallback to face center (use center_z)
-        tail_world = Vector((center_x, min_y, center_z))
+    bb = np.fromiter((c for corner in obj.bound_box for c in corner), dtype=np.float64, count=24).reshape(8, 3)
+    m = np.array(obj.matrix_world)
+    bbox_world = bb @ m[:3, :3].T + m[:3, 3]
+
+    # Reduce the corners to the y extents, X/Z center and the extreme Z on each
+    # y face. The kernel takes a batch so many bbox meshes can share one call.
+    min_y, max_y, center_x, center_z, top_z, bot_z = _bbox_reduce(bbox_world[np.newaxis])[0]
+
+    # Bone has no X variance (aligned straight on Y axis); head -> highest Z on
+    # the y-max face, tail -> lowest Z on the y-min face
+    head_world = Vector((center_x, max_y, top_z))
+    tail_world = Vector((center_x, min_y, bot_z))
 
     # Ensure head is above (higher Z) than tail; swap if necessary
     if head_world.z < tail_world.z:
@@ -68,21 +128,22 @@ def main():
     arm_obj = bpy.data.objects.new(obj.name + "_arm_obj", arm_data)
     bpy.context.collection.objects.link(arm_obj)
 
-    # Make the new armature active
-    bpy.context.view_layer.objects.active = arm_obj
-
-    # Enter edit mode and create one bone. Coordinates must be in armature-local space.
-    bpy.ops.object.mode_set(mode='EDIT')
+    # The armature is created fresh at the origin with an identity matrix_world,
+    # so armature-local coordinates equal world ones. Resolve them up front so
+    # the edit-mode window only assigns the bone.
     inv_mat = arm_obj.matrix_world.inverted()
     local_head = inv_mat @ head_world
     local_tail = inv_mat @ tail_world
 
-    eb = arm_obj.data.edit_bones
-    bone = eb.new('bbox_bone')
+    # Make the new armature active
+    bpy.context.view_layer.objects.active = arm_obj
+
+    # Enter edit mode and create one bone
+    bpy.ops.object.mode_set(mode='EDIT')
+    bone = arm_data.edit_bones.new('bbox_bone')
     bone.head = local_head
     bone.tail = local_tail
     bone.roll = 0.0
-
     bpy.ops.object.mode_set(mode='OBJECT')
 
     print(f"Created armature '{arm_obj.name}' with bone head at {head_world}, tail at {tail_world}")